@@ -1,7 +1,7 @@
 """Baseline entity extraction using regex and heuristics for business cards."""
 
 import re
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from src.utils import logger, get_empty_entity_dict, sanitize_text
 
 EMAIL_PATTERN: str = r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}"
@@ -9,6 +9,7 @@ PHONE_PATTERN: str = r"[\+]?[\d\s\-\(\)\.]{7,20}"
 WEBSITE_PATTERN: str = (
     r"(?:https?://)?(?:www\.)?[a-zA-Z0-9\-]+\.[a-zA-Z]{2,}(?:\.[a-zA-Z]{2,})?"
 )
+MAX_PHONES: int = 3
 
 DESIGNATION_KEYWORDS: List[str] = [
     "ceo", "cto", "cfo", "coo", "cmo", "vp", "president", "director",
@@ -29,102 +30,85 @@ ADDRESS_KEYWORDS: List[str] = [
     "po box", "p.o. box", "zip", "pin", "state", "city", "country",
 ]
 
+_EMAIL_RE: re.Pattern = re.compile(EMAIL_PATTERN, re.IGNORECASE)
+_PHONE_RE: re.Pattern = re.compile(PHONE_PATTERN)
+_WEBSITE_RE: re.Pattern = re.compile(WEBSITE_PATTERN, re.IGNORECASE)
+# Case-sensitive on purpose: the original extractor only stripped lowercase
+# http(s):// and www. prefixes before looking for phone numbers.
+_WEBSITE_STRIP_RE: re.Pattern = re.compile(WEBSITE_PATTERN)
+_WORD_RE: re.Pattern = re.compile(r"\w+")
 
-def _extract_emails(text_lines: List[str]) -> List[str]:
-    """Extract email addresses from text lines.
+
+def _split_keywords(keywords: List[str]) -> Tuple[frozenset, List[str]]:
+    """Split keywords into single-word tokens and multi-word phrases.
 
     Args:
-        text_lines: List of text strings to search.
+        keywords: Lowercase keyword list.
 
     Returns:
-        List[str]: List of found email addresses.
+        Tuple[frozenset, List[str]]: Single-word keywords for set lookup,
+            and the remaining phrases that need a regex search.
     """
-    emails = []
-    for line in text_lines:
-        found = re.findall(EMAIL_PATTERN, line, re.IGNORECASE)
-        emails.extend(found)
-    return emails
+    singles = frozenset(k for k in keywords if _WORD_RE.fullmatch(k))
+    return singles, [k for k in keywords if k not in singles]
 
 
-def _extract_phones(text_lines: List[str]) -> List[str]:
-    """Extract phone numbers from text lines.
+def _phrase_regex(phrases: List[str]) -> re.Pattern:
+    """Compile a word-bounded alternation matching any of the phrases.
 
     Args:
-        text_lines: List of text strings to search.
+        phrases: Lowercase keyword phrases.
 
     Returns:
-        List[str]: List of found phone numbers.
+        re.Pattern: The compiled pattern.
     """
-    phones = []
-    for line in text_lines:
-        if re.search(EMAIL_PATTERN, line):
-            continue
-        if re.search(WEBSITE_PATTERN, line):
-            cleaned = re.sub(WEBSITE_PATTERN, "", line)
-        else:
-            cleaned = line
-        found = re.findall(PHONE_PATTERN, cleaned)
-        for phone in found:
-            digits = re.sub(r"[^\d]", "", phone)
-            if 7 <= len(digits) <= 15:
-                phones.append(sanitize_text(phone))
-    return phones
-
-
-def _extract_websites(text_lines: List[str]) -> List[str]:
-    """Extract website URLs from text lines.
+    return re.compile(r"\b(?:" + "|".join(re.escape(p) for p in phrases) + r")\b")
 
-    Args:
-        text_lines: List of text strings to search.
 
-    Returns:
-        List[str]: List of found website URLs.
-    """
-    websites = []
-    for line in text_lines:
-        if re.search(EMAIL_PATTERN, line):
-            continue
-        found = re.findall(WEBSITE_PATTERN, line, re.IGNORECASE)
-        for site in found:
-            if not re.search(EMAIL_PATTERN, site):
-                websites.append(sanitize_text(site))
-    return websites
+_DESIGNATION_WORDS, _DESIGNATION_PHRASES = _split_keywords(DESIGNATION_KEYWORDS)
+_ADDRESS_WORDS, _ADDRESS_PHRASES = _split_keywords(ADDRESS_KEYWORDS)
+_DESIGNATION_PHRASE_RE: re.Pattern = _phrase_regex(_DESIGNATION_PHRASES)
+_ADDRESS_PHRASE_RE: re.Pattern = _phrase_regex(_ADDRESS_PHRASES)
+_ZIP_RE: re.Pattern = re.compile(r"\b\d{5,6}\b")
+_DIGIT_DELETE: Dict[int, None] = str.maketrans("", "", "0123456789")
 
 
-def _is_designation(text: str) -> bool:
+def _is_designation(lower_text: str, words: List[str]) -> bool:
     """Check if text likely contains a job designation.
 
     Args:
-        text: Text string to check.
+        lower_text: Lowercased text string to check.
+        words: Word tokens of lower_text.
 
     Returns:
         bool: True if the text appears to be a designation.
     """
-    lower_text = text.lower()
-    for keyword in DESIGNATION_KEYWORDS:
-        pattern = r"\b" + re.escape(keyword) + r"\b"
-        if re.search(pattern, lower_text):
-            return True
-    return False
+    if not _DESIGNATION_WORDS.isdisjoint(words):
+        return True
+    # The word-bounded regex can only match where a phrase occurs as a
+    # plain substring, and the substring test is far cheaper.
+    if not any(p in lower_text for p in _DESIGNATION_PHRASES):
+        return False
+    return bool(_DESIGNATION_PHRASE_RE.search(lower_text))
 
 
-def _is_address(text: str) -> bool:
+def _is_address(lower_text: str, words: List[str]) -> bool:
     """Check if text likely contains an address.
 
     Args:
-        text: Text string to check.
+        lower_text: Lowercased text string to check.
+        words: Word tokens of lower_text.
 
     Returns:
         bool: True if the text appears to be an address.
     """
-    lower_text = text.lower()
-    for keyword in ADDRESS_KEYWORDS:
-        pattern = r"\b" + re.escape(keyword) + r"\b"
-        if re.search(pattern, lower_text):
-            return True
-    if re.search(r"\b\d{5,6}\b", text):
+    if not _ADDRESS_WORDS.isdisjoint(words):
+        return True
+    if any(p in lower_text for p in _ADDRESS_PHRASES) and _ADDRESS_PHRASE_RE.search(
+        lower_text
+    ):
         return True
-    return False
+    return bool(_ZIP_RE.search(lower_text))
 
 
 def _has_mostly_digits(text: str) -> bool:
@@ -136,16 +120,21 @@ def _has_mostly_digits(text: str) -> bool:
     Returns:
         bool: True if over 50% of the characters are digits.
     """
-    digits = sum(1 for c in text if c.isdigit())
-    total = len(text.replace(" ", ""))
+    stripped = text.replace(" ", "")
+    total = len(stripped)
     if total == 0:
         return False
+    digits = total - len(stripped.translate(_DIGIT_DELETE))
     return digits / total > 0.5
 
 
 def extract_entities(text_lines: List[str]) -> Dict[str, str]:
     """Extract business card entities from OCR text using regex and heuristics.
 
+    Each line is scanned once: contact fields (email, phone, website) are
+    pulled out first, and lines not consumed by them are classified as
+    designation, address, name candidate, or company candidate.
+
     Args:
         text_lines: List of text strings extracted from a business card.
 
@@ -158,50 +147,53 @@ def extract_entities(text_lines: List[str]) -> Dict[str, str]:
         logger.warning("No text lines provided for entity extraction")
         return entities
 
-    emails = _extract_emails(text_lines)
-    phones = _extract_phones(text_lines)
-    websites = _extract_websites(text_lines)
-
-    if emails:
-        entities["Email"] = emails[0]
-    if phones:
-        entities["Phone"] = ", ".join(phones[:3])
-    if websites:
-        entities["Website"] = websites[0]
-
-    used_lines = set()
-    for i, line in enumerate(text_lines):
-        if re.search(EMAIL_PATTERN, line):
-            used_lines.add(i)
-        if _has_mostly_digits(line):
-            used_lines.add(i)
-        if re.search(WEBSITE_PATTERN, line) and not re.search(EMAIL_PATTERN, line):
-            used_lines.add(i)
-
-    remaining_lines = [
-        (i, line) for i, line in enumerate(text_lines) if i not in used_lines
-    ]
-
+    phones = []
     designations = []
     addresses = []
     name_candidates = []
     company_candidates = []
+    unclassified = []
+
+    for line in text_lines:
+        email_match = _EMAIL_RE.search(line)
+        if email_match is not None:
+            if not entities["Email"]:
+                entities["Email"] = email_match.group()
+            continue
+
+        if not entities["Website"]:
+            website_match = _WEBSITE_RE.search(line)
+            if website_match is not None:
+                entities["Website"] = website_match.group()
+        cleaned, website_count = _WEBSITE_STRIP_RE.subn("", line)
+        if len(phones) < MAX_PHONES:
+            for phone in _PHONE_RE.findall(cleaned):
+                digits = len(phone) - len(phone.translate(_DIGIT_DELETE))
+                if 7 <= digits <= 15:
+                    phones.append(sanitize_text(phone))
+
+        if website_count or _has_mostly_digits(line):
+            continue
 
-    for i, line in remaining_lines:
         clean_line = sanitize_text(line)
         if not clean_line:
+            unclassified.append(clean_line)
             continue
 
-        if _is_designation(clean_line):
+        lower_line = clean_line.lower()
+        words = _WORD_RE.findall(lower_line)
+        if _is_designation(lower_line, words):
             designations.append(clean_line)
-            used_lines.add(i)
-        elif _is_address(clean_line):
+        elif _is_address(lower_line, words):
             addresses.append(clean_line)
-            used_lines.add(i)
         elif len(clean_line.split()) <= 4 and clean_line.replace(" ", "").isalpha():
-            name_candidates.append((i, clean_line))
+            name_candidates.append(clean_line)
         else:
-            company_candidates.append((i, clean_line))
+            company_candidates.append(clean_line)
+            unclassified.append(clean_line)
+
+    if phones:
+        entities["Phone"] = ", ".join(phones[:MAX_PHONES])
 
     if designations:
         entities["Designation"] = designations[0]
@@ -210,23 +202,14 @@ def extract_entities(text_lines: List[str]) -> Dict[str, str]:
         entities["Address"] = ", ".join(addresses)
 
     if name_candidates:
-        entities["Name"] = name_candidates[0][1]
+        entities["Name"] = name_candidates[0]
         if len(name_candidates) > 1:
             company_candidates.insert(0, name_candidates[1])
-    elif remaining_lines:
-        unclassified = [
-            (i, line) for i, line in remaining_lines if i not in used_lines
-        ]
-        if unclassified:
-            entities["Name"] = sanitize_text(unclassified[0][1])
-
-    remaining_company = [
-        (i, line)
-        for i, line in company_candidates
-        if i not in used_lines and sanitize_text(line)
-    ]
-    if remaining_company:
-        entities["Company"] = remaining_company[0][1]
+    elif unclassified:
+        entities["Name"] = unclassified[0]
+
+    if company_candidates:
+        entities["Company"] = company_candidates[0]
 
     logger.info("Baseline extraction complete: %s", entities)
     return entities
@@ -1,11 +1,127 @@
 """Excel export module for structured business card data."""
 
+import io
 import os
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 from src.utils import logger, OUTPUT_DIR, ENTITY_FIELDS, DEFAULT_EXCEL_FILENAME
 
+_HEADER_FONT: Font = Font(name="Calibri", size=12, bold=True, color="FFFFFF")
+_HEADER_FILL: PatternFill = PatternFill(
+    start_color="2F5496", end_color="2F5496", fill_type="solid"
+)
+_HEADER_ALIGN: Alignment = Alignment(
+    horizontal="center", vertical="center", wrap_text=True
+)
+_CELL_FONT: Font = Font(name="Calibri", size=11)
+_CELL_ALIGN: Alignment = Alignment(vertical="top", wrap_text=True)
+_INDEX_ALIGN: Alignment = Alignment(horizontal="center")
+_THIN_BORDER: Border = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin"),
+)
+
+
+def _column_width(field: str) -> int:
+    """Return the Excel column width for an entity field.
+
+    Args:
+        field: The entity field name.
+
+    Returns:
+        int: Column width in characters.
+    """
+    if field in ("Address", "Company"):
+        return 35
+    if field in ("Email", "Website"):
+        return 30
+    if field == "Phone":
+        return 25
+    return 20
+
+
+_HEADERS: List[str] = ["#"] + ENTITY_FIELDS
+_COL_WIDTHS: Dict[str, int] = {
+    "#": 5,
+    **{field: _column_width(field) for field in ENTITY_FIELDS},
+}
+
+
+def _styled_cell(
+    ws: WriteOnlyWorksheet,
+    value: Any,
+    font: Font,
+    alignment: Alignment,
+    border: Border,
+    fill: Optional[PatternFill] = None,
+) -> WriteOnlyCell:
+    """Create a write-only cell with the given styles applied.
+
+    Args:
+        ws: The write-only worksheet the cell belongs to.
+        value: The cell value.
+        font: Font to apply.
+        alignment: Alignment to apply.
+        border: Border to apply.
+        fill: Optional fill to apply.
+
+    Returns:
+        WriteOnlyCell: The styled cell, ready to be appended in a row.
+    """
+    cell = WriteOnlyCell(ws, value=value)
+    cell.font = font
+    cell.alignment = alignment
+    cell.border = border
+    if fill is not None:
+        cell.fill = fill
+    return cell
+
+
+def _build_workbook(data: List[Dict[str, str]]) -> Workbook:
+    """Build a styled workbook from extracted business card data.
+
+    Uses openpyxl's write-only mode, so rows are streamed out as they are
+    appended instead of being kept as live cell objects.
+
+    Args:
+        data: List of dictionaries, each containing entity field values.
+
+    Returns:
+        Workbook: The populated openpyxl workbook.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Business Cards")
+
+    for col_idx, header in enumerate(_HEADERS, 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = _COL_WIDTHS[header]
+
+    ws.auto_filter.ref = "A1:%s%d" % (get_column_letter(len(_HEADERS)), len(data) + 1)
+
+    ws.append([
+        _styled_cell(
+            ws, header, _HEADER_FONT, _HEADER_ALIGN, _THIN_BORDER, _HEADER_FILL
+        )
+        for header in _HEADERS
+    ])
+
+    for row_num, record in enumerate(data, 1):
+        row = [_styled_cell(ws, row_num, _CELL_FONT, _INDEX_ALIGN, _THIN_BORDER)]
+        row.extend(
+            _styled_cell(
+                ws, record.get(field, ""), _CELL_FONT, _CELL_ALIGN, _THIN_BORDER
+            )
+            for field in ENTITY_FIELDS
+        )
+        ws.append(row)
+
+    return wb
+
 
 def export_to_excel(
     data: List[Dict[str, str]],
@@ -30,65 +146,7 @@ def export_to_excel(
     filepath = os.path.join(OUTPUT_DIR, filename)
 
     try:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Business Cards"
-
-        header_font = Font(name="Calibri", size=12, bold=True, color="FFFFFF")
-        header_fill = PatternFill(
-            start_color="2F5496", end_color="2F5496", fill_type="solid"
-        )
-        header_alignment = Alignment(
-            horizontal="center", vertical="center", wrap_text=True
-        )
-        cell_font = Font(name="Calibri", size=11)
-        cell_alignment = Alignment(vertical="top", wrap_text=True)
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
-
-        headers = ["#"] + ENTITY_FIELDS
-        for col_idx, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_idx, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-            cell.border = thin_border
-
-        for row_idx, record in enumerate(data, 2):
-            ws.cell(row=row_idx, column=1, value=row_idx - 1).border = thin_border
-            ws.cell(row=row_idx, column=1).font = cell_font
-            ws.cell(row=row_idx, column=1).alignment = Alignment(horizontal="center")
-
-            for col_idx, field in enumerate(ENTITY_FIELDS, 2):
-                cell = ws.cell(
-                    row=row_idx, column=col_idx, value=record.get(field, "")
-                )
-                cell.font = cell_font
-                cell.alignment = cell_alignment
-                cell.border = thin_border
-
-        column_widths = {"#": 5}
-        for field in ENTITY_FIELDS:
-            if field in ("Address", "Company"):
-                column_widths[field] = 35
-            elif field in ("Email", "Website"):
-                column_widths[field] = 30
-            elif field == "Phone":
-                column_widths[field] = 25
-            else:
-                column_widths[field] = 20
-
-        for col_idx, header in enumerate(headers, 1):
-            ws.column_dimensions[
-                ws.cell(row=1, column=col_idx).column_letter
-            ].width = column_widths.get(header, 20)
-
-        ws.auto_filter.ref = ws.dimensions
-        wb.save(filepath)
+        _build_workbook(data).save(filepath)
         logger.info("Excel file exported: %s (%d records)", filepath, len(data))
         return filepath
 
@@ -98,7 +156,7 @@ def export_to_excel(
 
 
 def export_to_excel_bytes(data: List[Dict[str, str]]) -> Optional[bytes]:
-    """Export data to Excel and return as bytes for download.
+    """Export data to an in-memory Excel file and return it for download.
 
     Args:
         data: List of dictionaries, each containing entity field values.
@@ -110,13 +168,11 @@ def export_to_excel_bytes(data: List[Dict[str, str]]) -> Optional[bytes]:
         logger.warning("No data provided for Excel export")
         return None
 
-    filepath = export_to_excel(data)
-    if filepath is None:
-        return None
-
     try:
-        with open(filepath, "rb") as f:
-            return f.read()
+        buffer = io.BytesIO()
+        _build_workbook(data).save(buffer)
+        logger.info("Excel bytes exported (%d records)", len(data))
+        return buffer.getvalue()
     except Exception as e:
-        logger.error("Failed to read Excel file: %s", str(e))
+        logger.error("Excel export failed: %s", str(e))
         return None
@@ -1,17 +1,42 @@
 """Image processing module for business card images."""
 
+import io
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
-from PIL import Image, ImageEnhance, ImageFilter
-from src.utils import logger, UPLOAD_DIR, validate_file_extension
+from typing import List, Optional, Tuple
+from PIL import Image, ImageFilter, ImageStat
+from src.utils import (
+    logger,
+    UPLOAD_DIR,
+    PIPELINE_WORKERS,
+    COPY_CHUNK_SIZE,
+    OCR_MAX_SIDE,
+    validate_file_extension,
+)
+
+_CONTRAST_GAIN: float = 1.5
+(
+    _SHARPEN_SIZE,
+    _SHARPEN_SCALE,
+    _SHARPEN_OFFSET,
+    _SHARPEN_WEIGHTS,
+) = ImageFilter.SHARPEN.filterargs
+_CONTRAST_SHARPEN_WEIGHTS: Tuple[float, ...] = tuple(
+    _CONTRAST_GAIN * w for w in _SHARPEN_WEIGHTS
+)
 
 
 def save_uploaded_image(uploaded_file: any, filename: str) -> Optional[str]:
     """Save an uploaded file to the uploads directory.
 
+    The content is streamed through a COPY_CHUNK_SIZE buffer rather than
+    written as one blob.
+
     Args:
-        uploaded_file: The file object from Streamlit uploader.
+        uploaded_file: The file object from Streamlit uploader, or any
+            object exposing read() or getbuffer().
         filename: The original filename.
 
     Returns:
@@ -24,8 +49,14 @@ def save_uploaded_image(uploaded_file: any, filename: str) -> Optional[str]:
     try:
         safe_filename = Path(filename).name
         filepath = os.path.join(UPLOAD_DIR, safe_filename)
-        with open(filepath, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+        with open(filepath, "wb", buffering=COPY_CHUNK_SIZE) as f:
+            if hasattr(uploaded_file, "read"):
+                uploaded_file.seek(0)
+                shutil.copyfileobj(uploaded_file, f, length=COPY_CHUNK_SIZE)
+            else:
+                view = memoryview(uploaded_file.getbuffer())
+                for start in range(0, len(view), COPY_CHUNK_SIZE):
+                    f.write(view[start:start + COPY_CHUNK_SIZE])
         logger.info("Saved uploaded image: %s", filepath)
         return filepath
     except Exception as e:
@@ -33,11 +64,74 @@ def save_uploaded_image(uploaded_file: any, filename: str) -> Optional[str]:
         return None
 
 
+def _limit_size(img: Image.Image) -> Image.Image:
+    """Downscale an image so its longest side is at most OCR_MAX_SIDE.
+
+    OCR detection cost grows with pixel count, and card text stays
+    legible at this size, so larger phone photos are shrunk first.
+
+    Args:
+        img: The image to limit.
+
+    Returns:
+        Image.Image: The resized image, or the original if already small.
+    """
+    width, height = img.size
+    scale = OCR_MAX_SIDE / max(width, height)
+    if scale >= 1:
+        return img
+    new_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    return img.resize(new_size, Image.LANCZOS)
+
+
+def _load_for_ocr(img: Image.Image) -> Image.Image:
+    """Decode an opened image to grayscale and downscale it for OCR.
+
+    JPEGs are decoded straight to grayscale by libjpeg via Image.draft, at
+    the smallest DCT scale (1/2, 1/4 or 1/8) that still leaves the longest
+    side at least OCR_MAX_SIDE, so this must be called before the image
+    data is loaded.
+
+    Args:
+        img: A freshly opened PIL image.
+
+    Returns:
+        Image.Image: The loaded grayscale image, at most OCR_MAX_SIDE.
+    """
+    width, height = img.size
+    scale = min(1.0, OCR_MAX_SIDE / max(width, height))
+    img.draft("L", (max(1, int(width * scale)), max(1, int(height * scale))))
+    img = img.convert("L")
+    return _limit_size(img)
+
+
+def enhance_image(img: Image.Image) -> Image.Image:
+    """Contrast-enhance and sharpen an image returned by decode_image_bytes.
+
+    Contrast and sharpening run as a single fused convolution: contrast is
+    the affine map gain * (x - mean) + mean, and the SHARPEN kernel sums to
+    its scale, so scaling the kernel by the gain and offsetting by
+    (1 - gain) * mean gives the same result in one pass over the pixels.
+
+    Args:
+        img: A grayscale image already limited to OCR_MAX_SIDE.
+
+    Returns:
+        Image.Image: The enhanced grayscale image.
+    """
+    mean = int(ImageStat.Stat(img).mean[0] + 0.5)
+    kernel = ImageFilter.Kernel(
+        _SHARPEN_SIZE,
+        _CONTRAST_SHARPEN_WEIGHTS,
+        scale=_SHARPEN_SCALE,
+        offset=_SHARPEN_OFFSET + (1 - _CONTRAST_GAIN) * mean,
+    )
+    return img.filter(kernel)
+
+
 def preprocess_image(image_path: str) -> Optional[str]:
     """Preprocess a business card image for better OCR results.
 
-    Applies grayscale conversion, contrast enhancement, and sharpening.
-
     Args:
         image_path: Path to the input image.
 
@@ -45,13 +139,10 @@ def preprocess_image(image_path: str) -> Optional[str]:
         Optional[str]: Path to the preprocessed image, or None on failure.
     """
     try:
-        img = Image.open(image_path)
-        img = img.convert("L")
-        enhancer = ImageEnhance.Contrast(img)
-        img = enhancer.enhance(1.5)
-        img = img.filter(ImageFilter.SHARPEN)
+        with Image.open(image_path) as img:
+            processed = enhance_image(_load_for_ocr(img))
         processed_path = os.path.splitext(image_path)[0] + "_processed.png"
-        img.save(processed_path)
+        processed.save(processed_path)
         logger.info("Preprocessed image saved: %s", processed_path)
         return processed_path
     except Exception as e:
@@ -59,6 +150,46 @@ def preprocess_image(image_path: str) -> Optional[str]:
         return None
 
 
+def decode_image_bytes(raw_bytes: bytes) -> Optional[Image.Image]:
+    """Decode an image in memory to grayscale at OCR size, without enhancement.
+
+    Args:
+        raw_bytes: The raw image file content.
+
+    Returns:
+        Optional[Image.Image]: The decoded image, or None on failure.
+    """
+    try:
+        with Image.open(io.BytesIO(raw_bytes)) as img:
+            return _load_for_ocr(img)
+    except Exception as e:
+        logger.error("In-memory image decoding failed: %s", str(e))
+        return None
+
+
+def preprocess_images(
+    image_paths: List[str], workers: Optional[int] = None
+) -> List[Optional[str]]:
+    """Preprocess a batch of images concurrently.
+
+    Pillow releases the GIL while decoding and filtering, so a thread pool
+    overlaps the per-image work.
+
+    Args:
+        image_paths: Paths to the input images.
+        workers: Maximum number of threads; defaults to PIPELINE_WORKERS.
+
+    Returns:
+        List[Optional[str]]: Preprocessed image paths in input order, with
+            None for images that failed.
+    """
+    if not image_paths:
+        return []
+    max_workers = min(workers or PIPELINE_WORKERS, len(image_paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(preprocess_image, image_paths))
+
+
 def get_image_dimensions(image_path: str) -> Optional[Tuple[int, int]]:
     """Get the dimensions of an image.
 
@@ -83,10 +214,10 @@ def cleanup_processed_images(directory: str) -> None:
         directory: Path to the directory to clean.
     """
     try:
-        for filename in os.listdir(directory):
-            if filename.endswith("_processed.png"):
-                filepath = os.path.join(directory, filename)
-                os.remove(filepath)
-                logger.info("Cleaned up: %s", filepath)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith("_processed.png") and entry.is_file():
+                    os.remove(entry.path)
+                    logger.info("Cleaned up: %s", entry.path)
     except Exception as e:
         logger.error("Cleanup failed: %s", str(e))
@@ -1,74 +1,329 @@
 """OCR engine module using EasyOCR for text extraction from business cards."""
 
-from typing import List, Optional, Dict, Any
+import threading
+from concurrent.futures import Future
+from typing import List, Optional, Dict, Any, Tuple, Union
 import easyocr
-from src.utils import logger, OCR_LANGUAGES
+import numpy as np
+from PIL import Image
+from src.image_processor import enhance_image
+from src.utils import (
+    logger,
+    OCR_LANGUAGES,
+    OCR_BATCH_SIZE,
+    OCR_FAST_PATH_CONFIDENCE,
+    OCR_QUANTIZE,
+)
 
 _reader: Optional[easyocr.Reader] = None
+_reader_lock = threading.Lock()
+_warmup: Optional["Future[easyocr.Reader]"] = None
+_warmup_lock = threading.Lock()
 
 
 def get_reader() -> easyocr.Reader:
     """Get or create a singleton EasyOCR reader instance.
 
+    The recognizer uses dynamic INT8 quantization on CPU unless the
+    EASYOCR_QUANTIZE environment variable is set to something other than "1".
+
     Returns:
         easyocr.Reader: The EasyOCR reader instance.
     """
     global _reader
-    if _reader is None:
-        logger.info("Initializing EasyOCR reader with languages: %s", OCR_LANGUAGES)
-        _reader = easyocr.Reader(OCR_LANGUAGES, gpu=False)
-        logger.info("EasyOCR reader initialized successfully")
+    if _reader is not None:
+        return _reader
+    with _reader_lock:
+        if _reader is None:
+            logger.info(
+                "Initializing EasyOCR reader with languages: %s", OCR_LANGUAGES
+            )
+            _reader = easyocr.Reader(
+                OCR_LANGUAGES, gpu=False, quantize=OCR_QUANTIZE
+            )
+            logger.info(
+                "EasyOCR reader initialized successfully (quantize=%s)",
+                OCR_QUANTIZE,
+            )
     return _reader
 
 
-def extract_text(image_path: str) -> List[str]:
+def warm_up_reader() -> "Future[easyocr.Reader]":
+    """Start loading the EasyOCR reader on a background thread.
+
+    Call this at application startup so the model loads while the user is
+    still uploading cards. Later get_reader calls wait for the load in
+    progress instead of starting a second one; the returned future can be
+    used to wait explicitly. Repeated calls return the same future.
+
+    Returns:
+        Future[easyocr.Reader]: Resolves to the shared reader instance.
+    """
+    global _warmup
+    with _warmup_lock:
+        if _warmup is not None:
+            return _warmup
+        future: "Future[easyocr.Reader]" = Future()
+
+        def load() -> None:
+            try:
+                future.set_result(get_reader())
+            except Exception as e:
+                logger.error("Background EasyOCR initialization failed: %s", str(e))
+                future.set_exception(e)
+
+        threading.Thread(target=load, name="easyocr-warmup", daemon=True).start()
+        _warmup = future
+        return future
+
+
+def _describe(image: Union[str, np.ndarray]) -> str:
+    """Return a short label for an OCR input, for log messages.
+
+    Args:
+        image: Path to an image file or a decoded array.
+
+    Returns:
+        str: The path, or the array shape for in-memory images.
+    """
+    if isinstance(image, str):
+        return image
+    return "in-memory image %s" % (image.shape,)
+
+
+def _clean_lines(results: List[str]) -> List[str]:
+    """Strip OCR output lines and drop empty ones.
+
+    Args:
+        results: Raw text strings returned by EasyOCR.
+
+    Returns:
+        List[str]: Non-empty stripped text lines.
+    """
+    return [line.strip() for line in results if line.strip()]
+
+
+def extract_text(image: Union[str, np.ndarray]) -> List[str]:
     """Extract text lines from a business card image using EasyOCR.
 
     Args:
-        image_path: Path to the image file.
+        image: Path to the image file, or a decoded image array.
 
     Returns:
         List[str]: List of extracted text strings.
     """
     try:
         reader = get_reader()
-        results = reader.readtext(image_path, detail=0, paragraph=False)
-        text_lines = [line.strip() for line in results if line.strip()]
-        logger.info("Extracted %d text lines from %s", len(text_lines), image_path)
+        results = reader.readtext(image, detail=0, paragraph=False)
+        text_lines = _clean_lines(results)
+        logger.info(
+            "Extracted %d text lines from %s", len(text_lines), _describe(image)
+        )
         return text_lines
     except Exception as e:
-        logger.error("OCR extraction failed for %s: %s", image_path, str(e))
+        logger.error("OCR extraction failed for %s: %s", _describe(image), str(e))
+        return []
+
+
+def _segments(results: List[Tuple[Any, str, float]]) -> List[Dict[str, Any]]:
+    """Convert detailed EasyOCR output into segment dicts.
+
+    Args:
+        results: (bbox, text, confidence) tuples returned by EasyOCR.
+
+    Returns:
+        List[Dict[str, Any]]: Non-empty segments with 'text', 'confidence',
+            and 'bbox' keys.
+    """
+    extracted = []
+    for bbox, text, confidence in results:
+        if text.strip():
+            extracted.append({
+                "text": text.strip(),
+                "confidence": round(float(confidence), 4),
+                "bbox": bbox,
+            })
+    return extracted
+
+
+def _readtext_one(image: np.ndarray, detail: int) -> List[Any]:
+    """Run EasyOCR on one image, logging and returning [] on failure.
+
+    Args:
+        image: A decoded image array.
+        detail: EasyOCR detail level (0 for text only, 1 with boxes and
+            confidence).
+
+    Returns:
+        List[Any]: Raw EasyOCR results for the image.
+    """
+    try:
+        return get_reader().readtext(image, detail=detail, paragraph=False)
+    except Exception as e:
+        logger.error("OCR extraction failed for %s: %s", _describe(image), str(e))
         return []
 
 
-def extract_text_with_confidence(image_path: str) -> List[Dict[str, Any]]:
+def _readtext_grouped(images: List[np.ndarray], detail: int) -> List[List[Any]]:
+    """Run EasyOCR over several images with batched inference.
+
+    EasyOCR can only stack images of identical size, so images are grouped
+    by shape and each group is run through readtext_batched in chunks of
+    OCR_BATCH_SIZE. Single images and failed batches are read one by one.
+
+    Args:
+        images: Decoded image arrays.
+        detail: EasyOCR detail level passed to every call.
+
+    Returns:
+        List[List[Any]]: Raw EasyOCR results per image, in input order.
+    """
+    results: List[List[Any]] = [[] for _ in images]
+    groups: Dict[Tuple[int, ...], List[int]] = {}
+    for idx, image in enumerate(images):
+        groups.setdefault(image.shape, []).append(idx)
+
+    for shape, indices in groups.items():
+        for start in range(0, len(indices), OCR_BATCH_SIZE):
+            chunk = indices[start:start + OCR_BATCH_SIZE]
+            if len(chunk) == 1:
+                results[chunk[0]] = _readtext_one(images[chunk[0]], detail)
+                continue
+            try:
+                batch = get_reader().readtext_batched(
+                    [images[i] for i in chunk],
+                    batch_size=OCR_BATCH_SIZE,
+                    detail=detail,
+                    paragraph=False,
+                )
+                for idx, raw in zip(chunk, batch):
+                    results[idx] = raw
+                logger.info("Batched OCR over %d images of shape %s", len(chunk), shape)
+            except Exception as e:
+                logger.error("Batched OCR failed for shape %s: %s", shape, str(e))
+                for idx in chunk:
+                    results[idx] = _readtext_one(images[idx], detail)
+    return results
+
+
+def extract_text_batch(images: List[np.ndarray]) -> List[List[str]]:
+    """Extract text lines from several images with batched EasyOCR inference.
+
+    Args:
+        images: Decoded image arrays.
+
+    Returns:
+        List[List[str]]: Extracted text lines per image, in input order.
+    """
+    return [_clean_lines(raw) for raw in _readtext_grouped(images, detail=0)]
+
+
+def extract_text_with_confidence(
+    image: Union[str, np.ndarray],
+) -> List[Dict[str, Any]]:
     """Extract text with bounding boxes and confidence scores.
 
     Args:
-        image_path: Path to the image file.
+        image: Path to the image file or a decoded array.
 
     Returns:
         List[Dict[str, Any]]: List of dicts with 'text', 'confidence', and 'bbox' keys.
     """
     try:
         reader = get_reader()
-        results = reader.readtext(image_path)
-        extracted = []
-        for bbox, text, confidence in results:
-            if text.strip():
-                extracted.append({
-                    "text": text.strip(),
-                    "confidence": round(float(confidence), 4),
-                    "bbox": bbox,
-                })
+        extracted = _segments(reader.readtext(image))
         logger.info(
             "Extracted %d text segments with confidence from %s",
             len(extracted),
-            image_path,
+            _describe(image),
         )
         return extracted
     except Exception as e:
         logger.error(
-            "OCR extraction with confidence failed for %s: %s", image_path, str(e)
+            "OCR extraction with confidence failed for %s: %s",
+            _describe(image),
+            str(e),
         )
         return []
+
+
+def _fast_path_lines(
+    segments: List[Dict[str, Any]], label: str
+) -> Optional[List[str]]:
+    """Return the segment texts if OCR confidence is high enough to keep them.
+
+    Args:
+        segments: Segments from a first OCR pass on the unenhanced image.
+        label: Description of the image for log messages.
+
+    Returns:
+        Optional[List[str]]: The text lines, or None if the image should be
+            enhanced and read again.
+    """
+    if not segments:
+        return None
+    mean_conf = sum(seg["confidence"] for seg in segments) / len(segments)
+    if mean_conf >= OCR_FAST_PATH_CONFIDENCE:
+        logger.info("Fast path for %s: mean confidence %.3f", label, mean_conf)
+        return [seg["text"] for seg in segments]
+    logger.info(
+        "Low confidence for %s (%.3f), retrying with preprocessing",
+        label,
+        mean_conf,
+    )
+    return None
+
+
+def extract_text_adaptive(image: Image.Image) -> List[str]:
+    """Extract text lines, enhancing the image only when OCR needs it.
+
+    OCR first runs on the decoded, downscaled image (see
+    decode_image_bytes). If the mean segment confidence is at least
+    OCR_FAST_PATH_CONFIDENCE those lines are returned as-is; otherwise the
+    image is contrast-enhanced and sharpened and OCR runs again.
+
+    Args:
+        image: A grayscale image already limited to OCR_MAX_SIDE.
+
+    Returns:
+        List[str]: List of extracted text strings.
+    """
+    array = np.asarray(image)
+    segments = extract_text_with_confidence(array)
+    lines = _fast_path_lines(segments, _describe(array))
+    if lines is not None:
+        return lines
+    return extract_text(np.asarray(enhance_image(image))) or [
+        seg["text"] for seg in segments
+    ]
+
+
+def extract_text_batch_adaptive(images: List[Image.Image]) -> List[List[str]]:
+    """Batched counterpart of extract_text_adaptive.
+
+    The first OCR pass is batched over all images; only the low-confidence
+    ones are enhanced and read again, also in a batch.
+
+    Args:
+        images: Grayscale images already limited to OCR_MAX_SIDE.
+
+    Returns:
+        List[List[str]]: Extracted text lines per image, in input order.
+    """
+    arrays = [np.asarray(image) for image in images]
+    first_pass = [_segments(raw) for raw in _readtext_grouped(arrays, detail=1)]
+    results: List[List[str]] = [[] for _ in images]
+    retry: List[int] = []
+    for idx, segments in enumerate(first_pass):
+        lines = _fast_path_lines(segments, _describe(arrays[idx]))
+        if lines is None:
+            retry.append(idx)
+        else:
+            results[idx] = lines
+    if retry:
+        enhanced = extract_text_batch(
+            [np.asarray(enhance_image(images[idx])) for idx in retry]
+        )
+        for idx, lines in zip(retry, enhanced):
+            results[idx] = lines or [seg["text"] for seg in first_pass[idx]]
+    return results
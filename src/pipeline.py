@@ -0,0 +1,516 @@
+"""End-to-end card processing pipeline: decode, preprocess, OCR, and extract."""
+
+import hashlib
+import multiprocessing
+import queue
+import shelve
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import streamlit as st
+from PIL import Image
+from src.entity_baseline import extract_entities
+from src.image_processor import decode_image_bytes
+from src.ocr_engine import (
+    extract_text_adaptive,
+    extract_text_batch_adaptive,
+    get_reader,
+)
+from src.utils import (
+    logger,
+    validate_file_extension,
+    get_empty_entity_dict,
+    PIPELINE_WORKERS,
+    OCR_MAX_PROCESSES,
+    OCR_CACHE_TTL_SECONDS,
+    OCR_CACHE_PATH,
+    OCR_CACHE_VERSION,
+    OCR_CACHE_MAX_AGE_SECONDS,
+    OCR_CACHE_MAX_ENTRIES,
+    OCR_LANGUAGES,
+    OCR_QUANTIZE,
+    PREFETCH_DEPTH,
+    PREFETCH_POLL_SECONDS,
+)
+
+ProgressCallback = Callable[[int, int, str], None]
+CardResult = Dict[str, Any]
+
+_cache_lock = threading.Lock()
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+_CACHE_NAMESPACE: str = "v%d:%s:q%d:" % (
+    OCR_CACHE_VERSION, ",".join(OCR_LANGUAGES), OCR_QUANTIZE
+)
+
+
+def _content_key(raw_bytes: bytes) -> str:
+    """Return the key for an image in the persistent OCR cache.
+
+    The key combines the cache version and OCR settings with a hash of the
+    content, so results from older extraction code or other settings are
+    never served.
+
+    Args:
+        raw_bytes: The raw image file content.
+
+    Returns:
+        str: The namespaced hex SHA-1 digest of the bytes.
+    """
+    return _CACHE_NAMESPACE + hashlib.sha1(raw_bytes).hexdigest()
+
+
+def _open_cache() -> shelve.Shelf:
+    """Open the persistent OCR cache, creating its directory if needed.
+
+    Returns:
+        shelve.Shelf: The open cache; callers must hold _cache_lock.
+    """
+    Path(OCR_CACHE_PATH).parent.mkdir(parents=True, exist_ok=True)
+    return shelve.open(OCR_CACHE_PATH)
+
+
+def _cache_get(keys: List[str]) -> Dict[str, CardResult]:
+    """Look up previously extracted results in the persistent OCR cache.
+
+    All keys are read under a single open of the cache file. Entries older
+    than OCR_CACHE_MAX_AGE_SECONDS count as misses.
+
+    Args:
+        keys: Cache keys of the images.
+
+    Returns:
+        Dict[str, CardResult]: Cached entities for the keys that were found.
+    """
+    oldest = time.time() - OCR_CACHE_MAX_AGE_SECONDS
+    try:
+        with _cache_lock, _open_cache() as db:
+            found = {}
+            for key in set(keys):
+                entry = db.get(key)
+                if entry is not None and entry["stored_at"] >= oldest:
+                    found[key] = entry["entities"]
+            return found
+    except Exception as e:
+        logger.warning("OCR cache lookup failed: %s", str(e))
+        return {}
+
+
+def _cache_put(key: str, entities: CardResult) -> None:
+    """Store an extracted result in the persistent OCR cache.
+
+    The filename is not stored, and results with no recognized text are
+    skipped so failed uploads are retried next time.
+
+    Args:
+        key: Content hash of the image.
+        entities: The result returned by process_one.
+    """
+    if not entities.get("_raw_lines"):
+        return
+    record = {k: v for k, v in entities.items() if k != "_source_file"}
+    try:
+        with _cache_lock, _open_cache() as db:
+            db[key] = {"stored_at": time.time(), "entities": record}
+            if len(db) > OCR_CACHE_MAX_ENTRIES:
+                _prune_cache(db)
+    except Exception as e:
+        logger.warning("OCR cache store failed: %s", str(e))
+
+
+def _prune_cache(db: shelve.Shelf) -> None:
+    """Shrink the persistent OCR cache to 90% of OCR_CACHE_MAX_ENTRIES.
+
+    Entries from other cache versions, unreadable entries, and entries past
+    OCR_CACHE_MAX_AGE_SECONDS go first, then the oldest of the rest.
+    Pruning below the limit keeps this full scan from running on every store.
+
+    Args:
+        db: The open cache; the caller must hold _cache_lock.
+    """
+    oldest = time.time() - OCR_CACHE_MAX_AGE_SECONDS
+    stored: List[Tuple[float, str]] = []
+    for key in list(db.keys()):
+        try:
+            stored_at = db[key]["stored_at"] if key.startswith(_CACHE_NAMESPACE) else 0
+        except Exception:
+            stored_at = 0
+        if stored_at < oldest:
+            del db[key]
+        else:
+            stored.append((stored_at, key))
+    stored.sort()
+    excess = len(stored) - OCR_CACHE_MAX_ENTRIES * 9 // 10
+    for _, key in stored[:max(0, excess)]:
+        del db[key]
+    logger.info("Pruned OCR cache to %d entries", len(db))
+
+
+def _from_cache(name: str, record: CardResult) -> CardResult:
+    """Build a result for an upload from a cached record.
+
+    Args:
+        name: The original filename of the uploaded card.
+        record: The cached entities for the upload's content.
+
+    Returns:
+        CardResult: A copy of the record tagged with '_source_file'.
+    """
+    logger.info("OCR cache hit for %s", name)
+    entities = dict(record)
+    entities["_source_file"] = name
+    return entities
+
+
+def _decode_for_ocr(name: str, raw_bytes: bytes) -> Optional[Image.Image]:
+    """Decode an upload to a grayscale image at OCR size.
+
+    Enhancement is left to the OCR step, which only applies it to cards
+    that read with low confidence.
+
+    Args:
+        name: The original filename of the uploaded card.
+        raw_bytes: The raw image file content.
+
+    Returns:
+        Optional[Image.Image]: The decoded image, or None if the upload is
+            unsupported or cannot be decoded.
+    """
+    if not validate_file_extension(name):
+        logger.warning("Unsupported file extension: %s", name)
+        return None
+    return decode_image_bytes(raw_bytes)
+
+
+def _build_result(name: str, text_lines: List[str]) -> CardResult:
+    """Run entity extraction on OCR output and attach card metadata.
+
+    Args:
+        name: The original filename of the uploaded card.
+        text_lines: OCR text lines; empty if the card could not be read.
+
+    Returns:
+        CardResult: Extracted entities plus '_source_file' and '_raw_lines'.
+    """
+    if text_lines:
+        entities: CardResult = extract_entities(text_lines)
+    else:
+        entities = get_empty_entity_dict()
+    entities["_source_file"] = name
+    entities["_raw_lines"] = text_lines
+    return entities
+
+
+def _init_ocr_worker() -> None:
+    """Prepare an OCR worker process: one torch thread and a loaded reader.
+
+    Torch otherwise starts one thread per core in every worker, so a pool
+    of N processes would run N x cores threads on N cores. The EasyOCR
+    models are loaded here, once per worker, rather than by its first card.
+    """
+    import torch
+
+    torch.set_num_threads(1)
+    try:
+        get_reader()
+    except Exception as e:
+        # A failing initializer breaks the whole pool; let each card's OCR
+        # call retry the load and report its own error instead.
+        logger.error("EasyOCR initialization failed in worker: %s", str(e))
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    """Get or create the shared OCR worker pool.
+
+    The pool lives for the whole server process, so workers and the models
+    they load are reused across extractions instead of being spawned again
+    for every batch.
+
+    Returns:
+        ProcessPoolExecutor: A spawn-context pool of OCR_MAX_PROCESSES workers.
+    """
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            logger.info("Starting OCR worker pool with %d processes", OCR_MAX_PROCESSES)
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=OCR_MAX_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_ocr_worker,
+            )
+        return _ocr_pool
+
+
+def _discard_ocr_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken OCR worker pool so the next batch starts a fresh one.
+
+    Args:
+        pool: The pool that raised BrokenProcessPool.
+    """
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is pool:
+            _ocr_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def process_one(name: str, raw_bytes: bytes) -> CardResult:
+    """Process a single business card image from its raw bytes.
+
+    The image is decoded at OCR size, and OCR only enhances it when the
+    first read has low confidence (see extract_text_adaptive). Everything
+    stays in memory, so nothing is written to disk. Runs as a top-level function so
+    it can be pickled into worker processes.
+
+    Args:
+        name: The original filename of the uploaded card.
+        raw_bytes: The raw image file content.
+
+    Returns:
+        CardResult: Extracted entities plus '_source_file' and '_raw_lines'
+            (the OCR text lines, joined only when displayed).
+    """
+    image = _decode_for_ocr(name, raw_bytes)
+    text_lines = extract_text_adaptive(image) if image is not None else []
+    return _build_result(name, text_lines)
+
+
+@st.cache_data(ttl=OCR_CACHE_TTL_SECONDS, show_spinner=False)
+def ocr_and_extract(name: str, file_bytes: bytes) -> CardResult:
+    """Cached wrapper around process_one for use across Streamlit reruns.
+
+    Streamlit hashes the arguments, so re-processing an identical upload
+    returns the stored result without running OCR again. Misses fall back
+    to the persistent content-hash cache before running OCR.
+
+    Args:
+        name: The original filename of the uploaded card.
+        file_bytes: The raw image file content.
+
+    Returns:
+        CardResult: Extracted entities plus '_source_file' and '_raw_lines'.
+    """
+    key = _content_key(file_bytes)
+    record = _cache_get([key]).get(key)
+    if record is not None:
+        return _from_cache(name, record)
+    entities = process_one(name, file_bytes)
+    _cache_put(key, entities)
+    return entities
+
+
+def _prefetch_decoded(
+    files: List[Tuple[str, bytes]], pending: List[int]
+) -> Iterator[Tuple[int, Optional[Image.Image]]]:
+    """Yield decoded images for pending cards, decoding ahead in the background.
+
+    A producer thread decodes cards into a bounded queue
+    (PREFETCH_DEPTH deep), so disk and PIL work for the next card overlaps
+    OCR of the current one while capping the number of decoded images
+    held in memory. If the consumer stops early (for example when a progress
+    callback raises because Streamlit interrupted the script), the producer
+    notices within PREFETCH_POLL_SECONDS and exits instead of blocking on
+    the full queue.
+
+    Args:
+        files: List of (filename, raw bytes) tuples.
+        pending: Indices into files to decode, in order.
+
+    Yields:
+        Tuple[int, Optional[Image.Image]]: The file index and its decoded
+            image, or None if it could not be decoded.
+    """
+    decoded: "queue.Queue[Optional[Tuple[int, Optional[Image.Image]]]]" = (
+        queue.Queue(maxsize=PREFETCH_DEPTH)
+    )
+
+    stop = threading.Event()
+
+    def offer(item: Optional[Tuple[int, Optional[Image.Image]]]) -> bool:
+        while not stop.is_set():
+            try:
+                decoded.put(item, timeout=PREFETCH_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for idx in pending:
+                if stop.is_set() or not offer((idx, _decode_for_ocr(*files[idx]))):
+                    return
+        finally:
+            offer(None)
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item = decoded.get()
+            if item is None:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def _resolve_cached(
+    files: List[Tuple[str, bytes]],
+    progress_callback: Optional[ProgressCallback],
+) -> Tuple[List[CardResult], List[str], List[int]]:
+    """Fill in results for cards already in the persistent OCR cache.
+
+    Args:
+        files: List of (filename, raw bytes) tuples.
+        progress_callback: Optional progress callable, invoked per cache hit.
+
+    Returns:
+        Tuple[List[CardResult], List[str], List[int]]: Results with cache
+            hits filled in, content keys per file, and indices still to run.
+    """
+    results: List[CardResult] = [{} for _ in files]
+    keys = [_content_key(raw_bytes) for _, raw_bytes in files]
+    cached = _cache_get(keys)
+    pending: List[int] = []
+    hits = 0
+    for idx, (name, _) in enumerate(files):
+        record = cached.get(keys[idx])
+        if record is None:
+            pending.append(idx)
+            continue
+        results[idx] = _from_cache(name, record)
+        hits += 1
+        if progress_callback is not None:
+            progress_callback(hits, len(files), name)
+    return results, keys, pending
+
+
+def process_cards(
+    files: List[Tuple[str, bytes]],
+    progress_callback: Optional[ProgressCallback] = None,
+    use_processes: bool = True,
+) -> List[CardResult]:
+    """Process a batch of business card images in parallel.
+
+    Args:
+        files: List of (filename, raw bytes) tuples, read up front because
+            Streamlit upload objects cannot be pickled.
+        progress_callback: Optional callable receiving (done, total, filename)
+            as each card completes.
+        use_processes: Run OCR on the shared worker pool (see
+            _get_ocr_pool). Set False to run OCR serially in
+            this process while the next card is decoded on a background
+            thread; EasyOCR's Reader is not safe for concurrent readtext.
+
+    Returns:
+        List[CardResult]: One entity dict per input, in input order.
+    """
+    if not files:
+        return []
+
+    results, keys, pending = _resolve_cached(files, progress_callback)
+    if not pending:
+        logger.info("All %d cards served from OCR cache", len(files))
+        return results
+
+    done = len(files) - len(pending)
+    if not use_processes:
+        with closing(_prefetch_decoded(files, pending)) as prefetched:
+            for idx, image in prefetched:
+                name = files[idx][0]
+                text_lines = extract_text_adaptive(image) if image is not None else []
+                results[idx] = _build_result(name, text_lines)
+                _cache_put(keys[idx], results[idx])
+                done += 1
+                if progress_callback is not None:
+                    progress_callback(done, len(files), name)
+        logger.info("Processed %d cards with background prefetch", len(files))
+        return results
+
+    executor = _get_ocr_pool()
+    try:
+        futures = {executor.submit(process_one, *files[idx]): idx for idx in pending}
+    except BrokenProcessPool:
+        # A worker died after the previous batch finished; start over once.
+        _discard_ocr_pool(executor)
+        executor = _get_ocr_pool()
+        futures = {executor.submit(process_one, *files[idx]): idx for idx in pending}
+    try:
+        for future in as_completed(futures):
+            idx = futures[future]
+            name = files[idx][0]
+            done += 1
+            try:
+                results[idx] = future.result()
+                _cache_put(keys[idx], results[idx])
+            except BrokenProcessPool as e:
+                logger.error("OCR worker pool failed on %s: %s", name, str(e))
+                _discard_ocr_pool(executor)
+                results[idx] = _build_result(name, [])
+            except Exception as e:
+                logger.error("Card processing failed for %s: %s", name, str(e))
+                results[idx] = _build_result(name, [])
+            if progress_callback is not None:
+                progress_callback(done, len(files), name)
+    finally:
+        for future in futures:
+            future.cancel()
+
+    logger.info("Processed %d cards on the OCR worker pool", len(files))
+    return results
+
+
+def process_cards_batched(
+    files: List[Tuple[str, bytes]],
+    progress_callback: Optional[ProgressCallback] = None,
+) -> List[CardResult]:
+    """Process a batch of business card images with one batched OCR pass.
+
+    Decoding runs on a thread pool, then every decoded card goes through
+    extract_text_batch_adaptive in the current process, so the
+    EasyOCR model is loaded once and its inference is amortized across
+    the batch.
+
+    Args:
+        files: List of (filename, raw bytes) tuples.
+        progress_callback: Optional callable receiving (done, total, filename)
+            as each card completes.
+
+    Returns:
+        List[CardResult]: One entity dict per input, in input order.
+    """
+    if not files:
+        return []
+
+    results, keys, pending = _resolve_cached(files, progress_callback)
+    if not pending:
+        logger.info("All %d cards served from OCR cache", len(files))
+        return results
+
+    workers = min(PIPELINE_WORKERS, len(pending))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        images = list(
+            executor.map(lambda idx: _decode_for_ocr(*files[idx]), pending)
+        )
+
+    decoded = [idx for idx, image in zip(pending, images) if image is not None]
+    texts = extract_text_batch_adaptive(
+        [image for image in images if image is not None]
+    )
+    text_by_idx = dict(zip(decoded, texts))
+
+    done = len(files) - len(pending)
+    for idx in pending:
+        name = files[idx][0]
+        results[idx] = _build_result(name, text_by_idx.get(idx, []))
+        _cache_put(keys[idx], results[idx])
+        done += 1
+        if progress_callback is not None:
+            progress_callback(done, len(files), name)
+
+    logger.info("Processed %d cards with batched OCR", len(files))
+    return results
@@ -2,15 +2,36 @@
 
 import os
 import logging
+import re
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any
 
 UPLOAD_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
 OUTPUT_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output")
 MAX_UPLOAD_COUNT: int = 20
 SUPPORTED_EXTENSIONS: tuple = (".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".webp")
+_SUPPORTED_EXTENSION_SET: frozenset = frozenset(SUPPORTED_EXTENSIONS)
 OCR_LANGUAGES: list = ["en"]
+OCR_BATCH_SIZE: int = 8
+OCR_MAX_SIDE: int = 1024
+OCR_FAST_PATH_CONFIDENCE: float = 0.85
+OCR_QUANTIZE: bool = os.environ.get("EASYOCR_QUANTIZE", "1") == "1"
 DEFAULT_EXCEL_FILENAME: str = "extracted_cards.xlsx"
+PIPELINE_WORKERS: int = os.cpu_count() or 1
+# Each OCR process loads its own EasyOCR model, so keep the pool small.
+OCR_MAX_PROCESSES: int = min(4, PIPELINE_WORKERS)
+PREFETCH_DEPTH: int = 2
+PREFETCH_POLL_SECONDS: float = 0.5
+OCR_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+COPY_CHUNK_SIZE: int = 1024 * 1024
+OCR_CACHE_PATH: str = os.path.join(
+    os.path.expanduser("~"), ".cache", "bci", "ocr.shelve"
+)
+# Bump when OCR or extraction changes, so older cached results are not served.
+OCR_CACHE_VERSION: int = 2
+OCR_CACHE_MAX_AGE_SECONDS: int = 30 * 24 * 60 * 60
+OCR_CACHE_MAX_ENTRIES: int = 2000
 
 ENTITY_FIELDS: list = [
     "Name",
@@ -21,6 +42,10 @@ ENTITY_FIELDS: list = [
     "Website",
     "Address",
 ]
+_EMPTY_ENTITY: MappingProxyType = MappingProxyType(
+    {field: "" for field in ENTITY_FIELDS}
+)
+_WHITESPACE_RE: re.Pattern = re.compile(r"\s+")
 
 logging.basicConfig(
     level=logging.INFO,
@@ -42,7 +67,7 @@ def get_empty_entity_dict() -> Dict[str, str]:
     Returns:
         Dict[str, str]: Dictionary with entity field names as keys.
     """
-    return {field: "" for field in ENTITY_FIELDS}
+    return dict(_EMPTY_ENTITY)
 
 
 def validate_file_extension(filename: str) -> bool:
@@ -54,8 +79,14 @@ def validate_file_extension(filename: str) -> bool:
     Returns:
         bool: True if the extension is supported, False otherwise.
     """
-    ext = os.path.splitext(filename)[1].lower()
-    return ext in SUPPORTED_EXTENSIONS
+    head, dot, ext = filename.rpartition(".")
+    if not dot or "." + ext.lower() not in _SUPPORTED_EXTENSION_SET:
+        return False
+    # Like os.path.splitext, a name made only of leading dots has no extension.
+    stem = head.rpartition(os.sep)[2]
+    if os.altsep:
+        stem = stem.rpartition(os.altsep)[2]
+    return stem.strip(".") != ""
 
 
 def sanitize_text(text: str) -> str:
@@ -69,6 +100,4 @@ def sanitize_text(text: str) -> str:
     """
     if not text:
         return ""
-    text = text.strip()
-    text = " ".join(text.split())
-    return text
+    return _WHITESPACE_RE.sub(" ", text).strip()
@@ -1,10 +1,115 @@
 import streamlit as st
 import pandas as pd
 from io import BytesIO
-import re
+from openpyxl import Workbook
 from PIL import Image
-import tempfile
-import os
+
+CARD_FIELDS = ["Name", "Title", "Company", "Email", "Phone", "Address", "Website"]
+DISPLAY_MAX_SIDE = 800
+
+# Sample data for demo, with each card's raw lines built once at import
+SAMPLE_CONTACTS = (
+    {
+        "Name": "John Doe",
+        "Title": "Software Engineer",
+        "Company": "Tech Company Inc.",
+        "Email": "john.doe@techcompany.com",
+        "Phone": "(555) 123-4567",
+        "Address": "123 Tech Street, Silicon Valley, CA 94000",
+        "Website": "www.techcompany.com"
+    },
+    {
+        "Name": "Jane Smith",
+        "Title": "Marketing Director",
+        "Company": "Creative Agency",
+        "Email": "jane.smith@creative.com",
+        "Phone": "(555) 987-6543",
+        "Address": "456 Design Ave, New York, NY 10001",
+        "Website": "www.creative.com"
+    },
+    {
+        "Name": "Robert Johnson",
+        "Title": "CEO",
+        "Company": "Startup Ventures",
+        "Email": "robert.j@startup.io",
+        "Phone": "(555) 246-8135",
+        "Address": "789 Innovation Blvd, Austin, TX 73301",
+        "Website": "www.startup.io"
+    }
+)
+SAMPLE_RAW_LINES = tuple(
+    tuple(contact[field] for field in CARD_FIELDS) for contact in SAMPLE_CONTACTS
+)
+
+
+@st.cache_data(show_spinner=False)
+def build_excel_bytes(rows):
+    """Build the Excel report for a tuple of card rows (cached across reruns)."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Business Cards')
+    ws.append(CARD_FIELDS)
+    for row in rows:
+        ws.append(row)
+    excel_buffer = BytesIO()
+    wb.save(excel_buffer)
+    return excel_buffer.getvalue()
+
+
+def cards_frame(cards):
+    """Project cards into the DataFrame shown in the editable grid."""
+    rows = [
+        [card.get("_source_file", "")] + [card.get(field, "") for field in CARD_FIELDS]
+        for card in cards
+    ]
+    return pd.DataFrame(rows, columns=["File"] + CARD_FIELDS)
+
+
+def export_rows(cards):
+    """Project cards into a hashable tuple of rows for the Excel report."""
+    return tuple(tuple(card.get(field, "") for field in CARD_FIELDS) for card in cards)
+
+
+def decode_for_display(uploaded_file):
+    """Decode an upload into a display-sized image, or None if unreadable."""
+    try:
+        uploaded_file.seek(0)
+        image = Image.open(uploaded_file)
+        image.thumbnail((DISPLAY_MAX_SIDE, DISPLAY_MAX_SIDE))
+        image.load()
+        return image
+    except Exception:
+        return None
+
+
+def preview_image(uploads_by_name, name):
+    """Return the display image for one upload, decoding it once per session."""
+    cache = st.session_state.setdefault("decoded_images", {})
+    for stale in cache.keys() - uploads_by_name.keys():
+        del cache[stale]
+    uploaded_file = uploads_by_name.get(name)
+    if uploaded_file is None:
+        return None
+    entry = cache.get(name)
+    if entry is None or entry[0] != uploaded_file.file_id:
+        entry = (uploaded_file.file_id, decode_for_display(uploaded_file))
+        cache[name] = entry
+    return entry[1]
+
+
+def mark_summary_dirty():
+    """Flag the cached summary metrics for recomputation."""
+    st.session_state._summary_dirty = True
+
+
+def refresh_summary_metrics():
+    """Recompute the summary metrics if cards changed."""
+    if not st.session_state.get("_summary_dirty", True):
+        return
+    cards = st.session_state.extracted_data
+    st.session_state._emails_found = sum(1 for c in cards if c.get("Email"))
+    st.session_state._phones_found = sum(1 for c in cards if c.get("Phone"))
+    st.session_state._summary_dirty = False
+
 
 # Debug - confirm app starts
 st.write("🚀 App started successfully!")
@@ -70,57 +175,23 @@ uploaded_files = st.file_uploader(
 )
 
 if uploaded_files:
-    if st.button("🔍 Extract Information", type="primary", use_container_width=True):
+    if st.button("🔍 Extract Information", type="primary", width="stretch"):
         st.session_state.extracted_data = []
+        st.session_state._grid_version = st.session_state.get("_grid_version", 0) + 1
+        mark_summary_dirty()
         
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        # Sample data for demo
-        sample_contacts = [
-            {
-                "Name": "John Doe",
-                "Title": "Software Engineer", 
-                "Company": "Tech Company Inc.",
-                "Email": "john.doe@techcompany.com",
-                "Phone": "(555) 123-4567",
-                "Address": "123 Tech Street, Silicon Valley, CA 94000",
-                "Website": "www.techcompany.com"
-            },
-            {
-                "Name": "Jane Smith",
-                "Title": "Marketing Director",
-                "Company": "Creative Agency", 
-                "Email": "jane.smith@creative.com",
-                "Phone": "(555) 987-6543",
-                "Address": "456 Design Ave, New York, NY 10001",
-                "Website": "www.creative.com"
-            },
-            {
-                "Name": "Robert Johnson",
-                "Title": "CEO",
-                "Company": "Startup Ventures",
-                "Email": "robert.j@startup.io", 
-                "Phone": "(555) 246-8135",
-                "Address": "789 Innovation Blvd, Austin, TX 73301",
-                "Website": "www.startup.io"
-            }
-        ]
-        
         for idx, uploaded_file in enumerate(uploaded_files):
             status_text.text(f"Processing card {idx + 1} of {len(uploaded_files)}: {uploaded_file.name}")
             progress_bar.progress((idx + 1) / len(uploaded_files))
             
             # Use sample data
-            sample_data = sample_contacts[idx % len(sample_contacts)].copy()
+            sample_idx = idx % len(SAMPLE_CONTACTS)
+            sample_data = dict(SAMPLE_CONTACTS[sample_idx])
             sample_data["_source_file"] = uploaded_file.name
-            sample_data["_raw_text"] = f"""{sample_data['Name']}
-{sample_data['Title']}
-{sample_data['Company']}
-{sample_data['Email']}
-{sample_data['Phone']}
-{sample_data['Address']}
-{sample_data['Website']}"""
+            sample_data["_raw_lines"] = SAMPLE_RAW_LINES[sample_idx]
             
             st.session_state.extracted_data.append(sample_data)
         
@@ -128,59 +199,77 @@ if uploaded_files:
         status_text.text("Processing complete!")
         st.success(f"Successfully processed {len(uploaded_files)} business card(s)!")
 
-# Display results
-if st.session_state.extracted_data:
-    st.divider()
-    st.subheader("📋 Extracted Information")
+@st.fragment
+def card_grid():
+    """Render every card in one editable grid; edits rerun only this fragment."""
+    cards = st.session_state.extracted_data
+    version = st.session_state.get("_grid_version", 0)
     
-    for card_idx, card_data in enumerate(st.session_state.extracted_data):
-        source_file = card_data.get("_source_file", f"Card {card_idx + 1}")
-        
-        with st.expander(f"Card {card_idx + 1}: {source_file}", expanded=True):
-            col_img, col_data = st.columns([1, 2])
-            
-            with col_img:
-                if uploaded_files:
-                    for uf in uploaded_files:
-                        if uf.name == source_file:
-                            st.image(uf, caption=source_file, use_container_width=True)
-                            break
-            
-            with col_data:
-                fields = ["Name", "Title", "Company", "Email", "Phone", "Address", "Website"]
-                for field in fields:
-                    value = st.text_input(
-                        field,
-                        value=card_data.get(field, ""),
-                        key=f"card_{card_idx}_{field}"
-                    )
-                    card_data[field] = value
-                
-                # Raw text toggle
-                if st.button("👁️ View Raw OCR Text", key=f"raw_{card_idx}"):
-                    st.text_area("Extracted Text", card_data.get("_raw_text", ""), height=150)
+    # Keep the grid's source frame fixed per extraction. Streamlit applies the
+    # widget's edits on top of it; rebuilding it from the edited cards would
+    # change the widget identity and drop the next edit.
+    if st.session_state.get("_grid_source_version") != version:
+        st.session_state._grid_source = cards_frame(cards)
+        st.session_state._grid_source_version = version
     
-    st.divider()
+    edited = st.data_editor(
+        st.session_state._grid_source,
+        key=f"card_grid_{version}",
+        num_rows="fixed",
+        disabled=["File"],
+        hide_index=True,
+        width="stretch"
+    )
     
-    # Export functionality
-    export_data = []
-    for card in st.session_state.extracted_data:
-        clean_card = {field: card.get(field, "") for field in ["Name", "Title", "Company", "Email", "Phone", "Address", "Website"]}
-        export_data.append(clean_card)
+    changed = False
+    for card, row in zip(cards, edited.to_dict("records")):
+        for field in CARD_FIELDS:
+            value = row[field] if isinstance(row[field], str) else ""
+            if card.get(field, "") != value:
+                card[field] = value
+                changed = True
+    if changed:
+        mark_summary_dirty()
+
+
+@st.fragment
+def card_preview(uploads_by_name):
+    """Show the selected card's image and raw OCR text in the sidebar."""
+    cards = st.session_state.extracted_data
+    st.subheader("🖼️ Card Preview")
+    card_idx = st.selectbox(
+        "Card",
+        range(len(cards)),
+        format_func=lambda i: f"Card {i + 1}: {cards[i].get('_source_file', '')}",
+        key="preview_card"
+    )
+    card_data = cards[card_idx]
+    source_file = card_data.get("_source_file", f"Card {card_idx + 1}")
     
-    df = pd.DataFrame(export_data)
-    excel_buffer = BytesIO()
-    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Business Cards')
-    excel_buffer.seek(0)
+    image = preview_image(uploads_by_name, card_data.get("_source_file"))
+    if image is not None:
+        st.image(image, caption=source_file, width="stretch")
+    
+    with st.expander("👁️ View Raw OCR Text"):
+        st.text_area(
+            "Extracted Text", "\n".join(card_data.get("_raw_lines", [])), height=150
+        )
+
+
+@st.fragment
+def export_summary():
+    """Render the download button and summary metrics as their own fragment."""
+    cards = st.session_state.extracted_data
+    refresh_summary_metrics()
     
+    # Deferred so the report reflects edits made since this fragment last ran
     st.download_button(
         label="📊 Download Excel Report",
-        data=excel_buffer.getvalue(),
+        data=lambda: build_excel_bytes(export_rows(cards)),
         file_name="business_cards_extracted.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         type="primary",
-        use_container_width=True
+        width="stretch"
     )
     
     st.divider()
@@ -188,13 +277,29 @@ if st.session_state.extracted_data:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Cards Processed", len(st.session_state.extracted_data))
+        st.metric("Cards Processed", len(cards))
     with col2:
-        emails_found = sum(1 for c in st.session_state.extracted_data if c.get("Email"))
-        st.metric("Emails Found", emails_found)
+        st.metric("Emails Found", st.session_state._emails_found)
     with col3:
-        phones_found = sum(1 for c in st.session_state.extracted_data if c.get("Phone"))
-        st.metric("Phones Found", phones_found)
+        st.metric("Phones Found", st.session_state._phones_found)
+    
+    st.button("🔄 Refresh Summary", key="refresh_summary")
+
+
+# Display results
+if st.session_state.extracted_data:
+    st.divider()
+    st.subheader("📋 Extracted Information")
+    
+    card_grid()
+    
+    with st.sidebar:
+        card_preview({uf.name: uf for uf in uploaded_files or []})
+    
+    st.divider()
+    
+    # Export functionality
+    export_summary()
 
 # Instructions
 if not st.session_state.extracted_data: